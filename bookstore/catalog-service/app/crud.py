@@ -1,65 +1,109 @@
 """CRUD operations for books."""
 from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import select, insert, update, or_, func
 from . import models, schemas
 
 
 def get_book(db: Session, book_id: int) -> Optional[models.Book]:
     """Get a single book by ID."""
-    return db.query(models.Book).filter(models.Book.id == book_id).first()
+    return db.execute(
+        select(models.Book).where(models.Book.id == book_id)
+    ).scalar_one_or_none()
 
 
 def get_book_by_isbn(db: Session, isbn: str) -> Optional[models.Book]:
     """Get a book by ISBN."""
-    return db.query(models.Book).filter(models.Book.isbn == isbn).first()
+    return db.execute(
+        select(models.Book).where(models.Book.isbn == isbn)
+    ).scalar_one_or_none()
 
 
 def get_books(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    search: Optional[str] = None
-) -> list[models.Book]:
-    """Get all books with optional search."""
-    query = db.query(models.Book)
-    
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            or_(
-                models.Book.title.ilike(search_pattern),
-                models.Book.author.ilike(search_pattern),
-                models.Book.isbn.ilike(search_pattern)
-            )
-        )
-    
-    return query.offset(skip).limit(limit).all()
+    search: Optional[str] = None,
+    cursor: Optional[int] = None
+) -> tuple[int, list[models.Book]]:
+    """Get a page of books plus the total count with optional search.
+
+    Search matches whole words against the generated search_vec document
+    (title + author + ISBN) via the GIN index, with a trigram-backed ILIKE
+    on title as the fallback for substring terms. The total is computed
+    with COUNT(*) OVER () in the same statement as the page rows, so the
+    search filter is only evaluated once per request.
 
+    When a keyset cursor (the last id of the previous page) is given it
+    replaces skip: the page starts right after that id, which stays
+    O(limit) at any depth instead of discarding skip rows. The total then
+    counts the rows remaining after the cursor.
+    """
+    stmt = select(models.Book, func.count().over().label('total'))
 
-def get_books_count(db: Session, search: Optional[str] = None) -> int:
-    """Get total count of books."""
-    query = db.query(models.Book)
-    
     if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
+        stmt = stmt.where(
             or_(
-                models.Book.title.ilike(search_pattern),
-                models.Book.author.ilike(search_pattern),
-                models.Book.isbn.ilike(search_pattern)
+                models.Book.search_vec.op('@@')(
+                    func.plainto_tsquery('simple', search)
+                ),
+                models.Book.title.ilike(f"%{search}%")
             )
         )
-    
-    return query.count()
+
+    if cursor is not None:
+        stmt = stmt.where(models.Book.id > cursor)
+        skip = 0
+
+    rows = db.execute(
+        stmt.order_by(models.Book.id).offset(skip).limit(limit)
+    ).all()
+
+    if rows:
+        return rows[0].total, [row.Book for row in rows]
+
+    # Empty page: either no matches at all, or skip walked past the end
+    if skip:
+        count_stmt = stmt.with_only_columns(func.count(models.Book.id))
+        return db.execute(count_stmt).scalar(), []
+    return 0, []
+
+
+def get_books_by_ids(db: Session, ids: list[int]) -> list[models.Book]:
+    """Get multiple books by ID in a single query."""
+    return db.execute(
+        select(models.Book).where(models.Book.id.in_(ids))
+    ).scalars().all()
+
+
+def reserve_book(db: Session, book_id: int, quantity: int) -> Optional[models.Book]:
+    """Atomically decrement stock if enough is available.
+
+    The check and the decrement happen in a single UPDATE ... WHERE
+    quantity >= :q RETURNING statement, so concurrent reservations
+    cannot oversell a book. Returns the updated book, or None when the
+    book does not exist or has insufficient stock.
+    """
+    stmt = (
+        update(models.Book)
+        .where(models.Book.id == book_id, models.Book.quantity >= quantity)
+        .values(quantity=models.Book.quantity - quantity)
+        .returning(models.Book)
+    )
+    db_book = db.execute(stmt).scalar_one_or_none()
+    db.commit()
+    return db_book
 
 
 def create_book(db: Session, book: schemas.BookCreate) -> models.Book:
-    """Create a new book."""
-    db_book = models.Book(**book.model_dump())
-    db.add(db_book)
+    """Create a new book.
+
+    INSERT ... RETURNING brings back the full row, including server
+    defaults, in one round-trip instead of a commit-then-refresh pair.
+    """
+    stmt = insert(models.Book).values(**book.model_dump()).returning(models.Book)
+    db_book = db.execute(stmt).scalar_one()
     db.commit()
-    db.refresh(db_book)
     return db_book
 
 
@@ -72,11 +116,11 @@ def update_book(
     db_book = get_book(db, book_id)
     if not db_book:
         return None
-    
+
     update_data = book_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_book, field, value)
-    
+
     db.commit()
     db.refresh(db_book)
     return db_book
@@ -87,7 +131,7 @@ def delete_book(db: Session, book_id: int) -> bool:
     db_book = get_book(db, book_id)
     if not db_book:
         return False
-    
+
     db.delete(db_book)
     db.commit()
     return True
@@ -1,9 +1,15 @@
 """Database connection and session management."""
 import os
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+
+def _orjson_serializer(obj) -> str:
+    """Serialize JSON column values with orjson (C-level encoder)."""
+    return orjson.dumps(obj).decode()
+
 # Get database URL from environment variable
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -11,10 +17,43 @@ DATABASE_URL = os.getenv(
 )
 
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, echo=True)
+# Pool is sized explicitly so concurrent workers don't exhaust connections;
+# pre_ping/recycle guard against stale connections after DB restarts.
+# For scaling beyond a single worker, point DATABASE_URL at a PgBouncer
+# sidecar on port 6432 instead of Postgres directly.
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    query_cache_size=1200,
+    json_serializer=_orjson_serializer,
+    json_deserializer=orjson.loads,
+    echo=True
+)
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps RETURNING-loaded rows usable after commit
+# without an extra SELECT
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine
+)
+
+# Read-only view of the engine running in AUTOCOMMIT, which skips the
+# per-request BEGIN/COMMIT pair the GET endpoints don't need
+read_engine = engine.execution_options(isolation_level='AUTOCOMMIT')
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=read_engine
+)
 
 # Create Base class for models
 Base = declarative_base()
@@ -27,3 +66,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Dependency for getting a read-only (autocommit) database session."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,19 +1,34 @@
 """Catalog Service - FastAPI Application."""
+import base64
+import binascii
+import threading
+from cachetools import TTLCache
 from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from . import crud, models, schemas
-from .database import engine, get_db
+from .database import engine, get_db, get_read_db
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
 
+# Short-lived response cache for the book listing, keyed by
+# (skip, limit, search) and cleared on any catalog write. Per-process
+# only - promote to Redis (same key shape) if multiple replicas need to
+# share hits. cachetools caches are not thread-safe and these sync
+# endpoints run concurrently in the threadpool, so every access goes
+# through the lock.
+_books_cache: TTLCache = TTLCache(maxsize=1024, ttl=10)
+_books_cache_lock = threading.Lock()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Bookstore Catalog Service",
     description="Microservice for managing book catalog",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 
@@ -34,22 +49,59 @@ def list_books(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     search: Optional[str] = Query(None, description="Search by title, author, or ISBN"),
-    db: Session = Depends(get_db)
+    ids: Optional[str] = Query(None, description="Comma-separated book IDs to fetch as a batch"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    db: Session = Depends(get_read_db)
 ):
     """
     List all books with optional search and pagination.
-    
+
     - **skip**: Number of records to skip (for pagination)
     - **limit**: Maximum number of records to return
     - **search**: Search term to filter books by title, author, or ISBN
+    - **ids**: Comma-separated book IDs to fetch in one batch (overrides
+      search and pagination); missing IDs are silently omitted
+    - **cursor**: Opaque keyset cursor from a previous page's next_cursor;
+      preferred over skip for deep pages as it stays fast at any depth
     """
-    books = crud.get_books(db, skip=skip, limit=limit, search=search)
-    total = crud.get_books_count(db, search=search)
-    return {"total": total, "books": books}
+    if ids:
+        try:
+            id_list = [int(value) for value in ids.split(',') if value.strip()]
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="ids must be a comma-separated list of integers"
+            )
+        books = crud.get_books_by_ids(db, ids=id_list)
+        return {"total": len(books), "books": books}
+
+    cursor_id = None
+    if cursor:
+        try:
+            cursor_id = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+        except (ValueError, binascii.Error):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    cache_key = (skip, limit, search, cursor_id)
+    with _books_cache_lock:
+        cached = _books_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    total, books = crud.get_books(
+        db, skip=skip, limit=limit, search=search, cursor=cursor_id
+    )
+    next_cursor = None
+    if len(books) == limit:
+        next_cursor = base64.urlsafe_b64encode(str(books[-1].id).encode()).decode()
+    response = {"total": total, "books": books, "next_cursor": next_cursor}
+    with _books_cache_lock:
+        _books_cache[cache_key] = response
+    return response
 
 
 @app.get("/books/{book_id}", response_model=schemas.Book)
-def get_book(book_id: int, db: Session = Depends(get_db)):
+def get_book(book_id: int, db: Session = Depends(get_read_db)):
     """
     Get a specific book by ID.
     
@@ -82,7 +134,45 @@ def create_book(book: schemas.BookCreate, db: Session = Depends(get_db)):
                 detail=f"Book with ISBN {book.isbn} already exists"
             )
     
-    return crud.create_book(db=db, book=book)
+    db_book = crud.create_book(db=db, book=book)
+    with _books_cache_lock:
+        _books_cache.clear()
+    return db_book
+
+
+@app.post("/books/{book_id}/reserve", response_model=schemas.Book)
+def reserve_book(
+    book_id: int,
+    reservation: schemas.BookReserve,
+    db: Session = Depends(get_db)
+):
+    """
+    Atomically reserve stock for a book.
+
+    Checks availability and decrements the quantity in a single statement,
+    so concurrent orders cannot oversell a book.
+
+    - **book_id**: The ID of the book to reserve
+    - **quantity**: Quantity to reserve (must be > 0)
+    """
+    db_book = crud.reserve_book(db, book_id=book_id, quantity=reservation.quantity)
+    if db_book is not None:
+        with _books_cache_lock:
+            _books_cache.clear()
+        return db_book
+
+    # Distinguish a missing book from insufficient stock
+    existing_book = crud.get_book(db, book_id=book_id)
+    if existing_book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+
+    raise HTTPException(
+        status_code=400,
+        detail=(
+            f"Insufficient stock. Available: {existing_book.quantity}, "
+            f"Required: {reservation.quantity}"
+        )
+    )
 
 
 @app.put("/books/{book_id}", response_model=schemas.Book)
@@ -109,6 +199,8 @@ def update_book(
     db_book = crud.update_book(db, book_id=book_id, book_update=book_update)
     if db_book is None:
         raise HTTPException(status_code=404, detail="Book not found")
+    with _books_cache_lock:
+        _books_cache.clear()
     return db_book
 
 
@@ -122,4 +214,6 @@ def delete_book(book_id: int, db: Session = Depends(get_db)):
     success = crud.delete_book(db, book_id=book_id)
     if not success:
         raise HTTPException(status_code=404, detail="Book not found")
+    with _books_cache_lock:
+        _books_cache.clear()
     return {"message": f"Book {book_id} deleted successfully"}
@@ -1,6 +1,6 @@
 """SQLAlchemy models for the catalog service."""
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Numeric, Text, DateTime
+from sqlalchemy import Column, Integer, String, Numeric, Text, DateTime, Index, Computed, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from .database import Base
 
 
@@ -16,8 +16,28 @@ class Book(Base):
     price = Column(Numeric(10, 2), nullable=False)
     quantity = Column(Integer, nullable=False, default=0)
     description = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps are assigned by the database so they stay consistent
+    # across app workers with drifting clocks
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Generated search document covering title, author and ISBN; one GIN
+    # index probe replaces three per-column predicates in crud.get_books
+    search_vec = Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || "
+            "coalesce(author, '') || ' ' || coalesce(isbn, ''))",
+            persisted=True
+        )
+    )
 
     def __repr__(self):
         return f"<Book(id={self.id}, title='{self.title}', author='{self.author}')>"
+
+
+# GIN index backing the full-text search in crud.get_books, plus a trigram
+# index on title as the fallback for substring matches (requires the pg_trgm
+# extension, enabled in db/init.sql)
+Index('books_search_vec', Book.search_vec, postgresql_using='gin')
+Index('books_title_trgm', Book.title, postgresql_using='gin',
+      postgresql_ops={'title': 'gin_trgm_ops'})
@@ -30,6 +30,11 @@ class BookUpdate(BaseModel):
     description: Optional[str] = None
 
 
+class BookReserve(BaseModel):
+    """Schema for reserving stock of a book."""
+    quantity: int = Field(..., gt=0, description="Quantity to reserve")
+
+
 class Book(BookBase):
     """Schema for book response with all fields."""
     id: int
@@ -43,6 +48,7 @@ class BookList(BaseModel):
     """Schema for list of books response."""
     total: int
     books: list[Book]
+    next_cursor: Optional[str] = None
 
 
 class Message(BaseModel):
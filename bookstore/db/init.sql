@@ -3,6 +3,11 @@
 
 \echo 'Starting bookstore database initialization...'
 
+-- Enable trigram matching for the ILIKE search indexes below
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+\echo 'Enabled pg_trgm extension'
+
 -- Create books table
 CREATE TABLE IF NOT EXISTS books (
     id SERIAL PRIMARY KEY,
@@ -13,7 +18,10 @@ CREATE TABLE IF NOT EXISTS books (
     quantity INTEGER NOT NULL DEFAULT 0 CHECK (quantity >= 0),
     description TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    search_vec TSVECTOR GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(author, '') || ' ' || coalesce(isbn, ''))
+    ) STORED
 );
 
 \echo 'Created books table'
@@ -23,6 +31,11 @@ CREATE INDEX IF NOT EXISTS idx_books_title ON books(title);
 CREATE INDEX IF NOT EXISTS idx_books_author ON books(author);
 CREATE INDEX IF NOT EXISTS idx_books_isbn ON books(isbn);
 
+-- Full-text index over the generated search document, plus a trigram index
+-- on title as the fallback for substring (leading-wildcard ILIKE) searches
+CREATE INDEX IF NOT EXISTS books_search_vec ON books USING gin (search_vec);
+CREATE INDEX IF NOT EXISTS books_title_trgm ON books USING gin (title gin_trgm_ops);
+
 \echo 'Created indexes for books table'
 
 -- Create orders table
@@ -34,8 +47,9 @@ CREATE TABLE IF NOT EXISTS orders (
     customer_email VARCHAR(255) NOT NULL,
     quantity INTEGER NOT NULL CHECK (quantity > 0),
     unit_price NUMERIC(10, 2) NOT NULL CHECK (unit_price > 0),
-    total_price NUMERIC(10, 2) NOT NULL CHECK (total_price > 0),
-    status VARCHAR(50) NOT NULL DEFAULT 'pending',
+    total_price NUMERIC(10, 2) NOT NULL GENERATED ALWAYS AS (unit_price * quantity) STORED,
+    status VARCHAR(50) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processing', 'confirmed', 'shipped', 'delivered', 'cancelled')),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_book FOREIGN KEY (book_id) REFERENCES books(id) ON DELETE RESTRICT
@@ -49,6 +63,13 @@ CREATE INDEX IF NOT EXISTS idx_orders_customer_email ON orders(customer_email);
 CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
 CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders(created_at DESC);
 
+-- Covering indexes matching the filter + ORDER BY created_at DESC shape of
+-- the order listing endpoint, so filtered pages avoid a sort step
+CREATE INDEX IF NOT EXISTS orders_email_created ON orders (customer_email, created_at DESC)
+    INCLUDE (id, book_id, status, total_price);
+CREATE INDEX IF NOT EXISTS orders_status_created ON orders (status, created_at DESC)
+    INCLUDE (id, book_id, customer_email, total_price);
+
 \echo 'Created indexes for orders table'
 
 -- Create function to update updated_at timestamp
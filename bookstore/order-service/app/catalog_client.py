@@ -1,6 +1,15 @@
 """HTTP Client for communicating with Catalog Service."""
+import asyncio
 import os
+import time
 import httpx
+from cachetools import TTLCache
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 from typing import Optional
 from decimal import Decimal
 
@@ -12,90 +21,303 @@ CATALOG_SERVICE_URL = os.getenv(
 )
 
 
+class CircuitBreakerOpen(Exception):
+    """Raised when the catalog circuit breaker is open."""
+
+    def __init__(self, message: str = "Catalog service is unavailable (circuit breaker open)"):
+        super().__init__(message)
+
+
+class CircuitBreaker:
+    """Minimal consecutive-failure circuit breaker.
+
+    After fail_max consecutive transport failures the breaker opens and
+    calls fail immediately without touching the network, so a degraded
+    catalog doesn't make every order wait out the full timeout. Once
+    reset_timeout seconds have passed, a trial call is let through and
+    its success closes the breaker again.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def before_call(self):
+        """Raise CircuitBreakerOpen if calls should fail fast."""
+        if self._opened_at is not None:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitBreakerOpen()
+            # Half-open: let the current call through as a trial
+
+    def record_success(self):
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            self._opened_at = time.monotonic()
+
+
 class CatalogClient:
-    """Client for interacting with the Catalog Service API."""
-    
-    def __init__(self, base_url: str = CATALOG_SERVICE_URL):
+    """Client for interacting with the Catalog Service API.
+
+    A single pooled httpx.AsyncClient is shared across all requests so that
+    connections are kept alive instead of paying a TCP+TLS handshake per call.
+    The client is created lazily (or injected for tests) and closed from the
+    application's lifespan handler.
+    """
+
+    def __init__(
+        self,
+        base_url: str = CATALOG_SERVICE_URL,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         self.base_url = base_url.rstrip('/')
         self.timeout = 10.0
-    
+        self._client = client
+        # Short-lived cache for hot book IDs; entries are refreshed or
+        # dropped whenever this client changes catalog stock. For
+        # multi-worker deployments, promote this to Redis (key book:{id})
+        # so all workers share hits.
+        self._book_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+        self._book_locks: dict[int, asyncio.Lock] = {}
+        self._breaker = CircuitBreaker(fail_max=5, reset_timeout=30.0)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared AsyncClient, created on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=50
+                ),
+                http2=True
+            )
+        return self._client
+
+    @retry(
+        retry=retry_if_exception_type((httpx.ConnectError, httpx.ConnectTimeout)),
+        stop=stop_after_attempt(2),
+        wait=wait_exponential(multiplier=0.1),
+        reraise=True
+    )
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Issue one catalog request through the retry/breaker policy.
+
+        Only connect-phase failures are retried (once, with a short
+        backoff): if the connection was never established the request
+        provably did not reach the server, so the retry is safe even for
+        non-idempotent calls like reserve. Failures after the request was
+        sent (e.g. a read timeout on a reservation the catalog may have
+        already committed) are not resent. All transport failures feed
+        the circuit breaker; while it is open, calls raise
+        CircuitBreakerOpen without touching the network.
+        """
+        self._breaker.before_call()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            self._breaker.record_failure()
+            raise
+        self._breaker.record_success()
+        return response
+
+    async def aclose(self):
+        """Close the shared client and its connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def get_book(self, book_id: int) -> Optional[dict]:
         """
-        Get book details from Catalog Service.
-        
+        Get book details from Catalog Service, caching hot IDs briefly.
+
+        Cache hits skip the HTTP round-trip entirely. A per-key lock
+        ensures that concurrent misses for the same book result in a
+        single upstream request instead of a stampede.
+
         Args:
             book_id: The ID of the book to retrieve
-            
+
         Returns:
             Book data as dictionary or None if not found
-            
+
         Raises:
             httpx.HTTPError: If the request fails
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(f"{self.base_url}/books/{book_id}")
-                
-                if response.status_code == 404:
-                    return None
-                
-                response.raise_for_status()
-                return response.json()
-            
-            except httpx.TimeoutException:
-                raise Exception("Catalog service is unavailable (timeout)")
-            except httpx.HTTPError as e:
-                raise Exception(f"Failed to communicate with catalog service: {str(e)}")
-    
+        if book_id in self._book_cache:
+            return self._book_cache[book_id]
+
+        lock = self._book_locks.setdefault(book_id, asyncio.Lock())
+        async with lock:
+            # Another waiter may have populated the cache while we blocked
+            if book_id in self._book_cache:
+                return self._book_cache[book_id]
+
+            book = await self._fetch_book(book_id)
+            self._book_cache[book_id] = book
+            return book
+
+    async def get_books(self, book_ids: list[int]) -> dict[int, Optional[dict]]:
+        """
+        Get details for several books in one catalog round-trip.
+
+        Cached entries are served directly; the remaining IDs go out as a
+        single batched GET /books?ids=... request instead of one call per
+        book. IDs missing from the catalog map to None.
+
+        Args:
+            book_ids: The IDs of the books to retrieve
+
+        Returns:
+            Mapping of book ID to book data (or None if not found)
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        books: dict[int, Optional[dict]] = {}
+        missing: list[int] = []
+        for book_id in dict.fromkeys(book_ids):
+            if book_id in self._book_cache:
+                books[book_id] = self._book_cache[book_id]
+            else:
+                missing.append(book_id)
+
+        if not missing:
+            return books
+
+        try:
+            response = await self._request(
+                "GET",
+                "/books",
+                params={"ids": ",".join(str(book_id) for book_id in missing)}
+            )
+            response.raise_for_status()
+            fetched = {book['id']: book for book in response.json()['books']}
+
+        except httpx.TimeoutException:
+            raise Exception("Catalog service is unavailable (timeout)")
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to communicate with catalog service: {str(e)}")
+
+        for book_id in missing:
+            book = fetched.get(book_id)
+            self._book_cache[book_id] = book
+            books[book_id] = book
+        return books
+
+    async def _fetch_book(self, book_id: int) -> Optional[dict]:
+        """Fetch book details from Catalog Service, bypassing the cache."""
+        try:
+            response = await self._request("GET", f"/books/{book_id}")
+
+            if response.status_code == 404:
+                return None
+
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.TimeoutException:
+            raise Exception("Catalog service is unavailable (timeout)")
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to communicate with catalog service: {str(e)}")
+
     async def check_availability(self, book_id: int, required_quantity: int) -> tuple[bool, Optional[dict], Optional[str]]:
         """
         Check if a book is available in the required quantity.
-        
+
         Args:
             book_id: The ID of the book
             required_quantity: The quantity needed
-            
+
         Returns:
             Tuple of (is_available, book_data, error_message)
         """
         try:
             book = await self.get_book(book_id)
-            
+
             if book is None:
                 return False, None, f"Book with ID {book_id} not found"
-            
+
             available_quantity = book.get('quantity', 0)
-            
+
             if available_quantity < required_quantity:
                 return False, book, f"Insufficient stock. Available: {available_quantity}, Required: {required_quantity}"
-            
+
             return True, book, None
-        
+
         except Exception as e:
             return False, None, str(e)
-    
+
+    async def reserve(self, book_id: int, quantity: int) -> tuple[bool, Optional[dict], Optional[str]]:
+        """
+        Atomically reserve stock for a book via the Catalog Service.
+
+        The catalog checks availability and decrements the quantity in a
+        single statement, so this is one round-trip with no race between
+        check and reservation.
+
+        Args:
+            book_id: The ID of the book
+            quantity: The quantity to reserve
+
+        Returns:
+            Tuple of (reserved, book_data, error_message)
+        """
+        try:
+            response = await self._request(
+                "POST",
+                f"/books/{book_id}/reserve",
+                json={"quantity": quantity}
+            )
+
+            if response.status_code in (400, 404):
+                detail = response.json().get('detail', 'Book is not available')
+                self._book_cache.pop(book_id, None)
+                return False, None, detail
+
+            response.raise_for_status()
+            book = response.json()
+            # The reservation response is the freshest view of the book
+            self._book_cache[book_id] = book
+            return True, book, None
+
+        except CircuitBreakerOpen as e:
+            return False, None, str(e)
+        except httpx.TimeoutException:
+            return False, None, "Catalog service is unavailable (timeout)"
+        except httpx.HTTPError as e:
+            return False, None, f"Failed to communicate with catalog service: {str(e)}"
+
     async def update_book_quantity(self, book_id: int, new_quantity: int) -> bool:
         """
         Update book quantity in the catalog (for inventory management).
-        
+
         Args:
             book_id: The ID of the book
             new_quantity: The new quantity value
-            
+
         Returns:
             True if successful, False otherwise
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.put(
-                    f"{self.base_url}/books/{book_id}",
-                    json={"quantity": new_quantity}
-                )
-                response.raise_for_status()
-                return True
-            
-            except httpx.HTTPError:
-                return False
+        try:
+            response = await self._request(
+                "PUT",
+                f"/books/{book_id}",
+                json={"quantity": new_quantity}
+            )
+            response.raise_for_status()
+            self._book_cache.pop(book_id, None)
+            return True
+
+        except (httpx.HTTPError, CircuitBreakerOpen):
+            return False
 
 
 # Global catalog client instance
@@ -1,54 +1,72 @@
 """CRUD operations for orders."""
+from datetime import datetime
 from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, desc, func, tuple_
 from decimal import Decimal
 from . import models, schemas
 
 
-def get_order(db: Session, order_id: int) -> Optional[models.Order]:
+async def get_order(db: AsyncSession, order_id: int) -> Optional[models.Order]:
     """Get a single order by ID."""
-    return db.query(models.Order).filter(models.Order.id == order_id).first()
+    result = await db.execute(
+        select(models.Order).where(models.Order.id == order_id)
+    )
+    return result.scalar_one_or_none()
 
 
-def get_orders(
-    db: Session,
+async def get_orders(
+    db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
     customer_email: Optional[str] = None,
-    status: Optional[str] = None
-) -> list[models.Order]:
-    """Get all orders with optional filtering."""
-    query = db.query(models.Order)
-    
-    if customer_email:
-        query = query.filter(models.Order.customer_email == customer_email)
-    
-    if status:
-        query = query.filter(models.Order.status == status)
-    
-    return query.order_by(desc(models.Order.created_at)).offset(skip).limit(limit).all()
+    status: Optional[str] = None,
+    cursor: Optional[tuple[datetime, int]] = None
+) -> tuple[int, list[models.Order]]:
+    """Get a page of orders plus the total count with optional filtering.
 
+    The total is computed with COUNT(*) OVER () in the same statement as
+    the page rows, so the filter is only evaluated once per request.
+
+    When a keyset cursor (the last row's (created_at, id) from the
+    previous page) is given it replaces skip: the page starts right after
+    that row, which stays O(limit) at any depth instead of discarding
+    skip rows. The total then counts the rows remaining after the cursor.
+    """
+    stmt = select(models.Order, func.count().over().label('total'))
 
-def get_orders_count(
-    db: Session,
-    customer_email: Optional[str] = None,
-    status: Optional[str] = None
-) -> int:
-    """Get total count of orders."""
-    query = db.query(models.Order)
-    
     if customer_email:
-        query = query.filter(models.Order.customer_email == customer_email)
-    
+        stmt = stmt.where(models.Order.customer_email == customer_email)
+
     if status:
-        query = query.filter(models.Order.status == status)
-    
-    return query.count()
+        stmt = stmt.where(models.Order.status == status)
+
+    if cursor is not None:
+        stmt = stmt.where(
+            tuple_(models.Order.created_at, models.Order.id) < cursor
+        )
+        skip = 0
+
+    result = await db.execute(
+        stmt
+        .order_by(desc(models.Order.created_at), desc(models.Order.id))
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = result.all()
+
+    if rows:
+        return rows[0].total, [row.Order for row in rows]
+
+    # Empty page: either no matches at all, or skip walked past the end
+    if skip:
+        count_stmt = stmt.with_only_columns(func.count(models.Order.id))
+        return (await db.execute(count_stmt)).scalar(), []
+    return 0, []
 
 
-def create_order(
-    db: Session,
+async def create_order(
+    db: AsyncSession,
     book_id: int,
     book_title: str,
     customer_name: str,
@@ -56,48 +74,53 @@ def create_order(
     quantity: int,
     unit_price: Decimal
 ) -> models.Order:
-    """Create a new order."""
-    total_price = unit_price * quantity
-    
-    db_order = models.Order(
-        book_id=book_id,
-        book_title=book_title,
-        customer_name=customer_name,
-        customer_email=customer_email,
-        quantity=quantity,
-        unit_price=unit_price,
-        total_price=total_price,
-        status='pending'
+    """Create a new order.
+
+    total_price is a generated column computed by the database from
+    unit_price * quantity, so it is not assigned here. INSERT ...
+    RETURNING brings back the full row, including generated and default
+    columns, in one round-trip instead of a commit-then-refresh pair.
+    """
+    stmt = (
+        insert(models.Order)
+        .values(
+            book_id=book_id,
+            book_title=book_title,
+            customer_name=customer_name,
+            customer_email=customer_email,
+            quantity=quantity,
+            unit_price=unit_price,
+            status='pending'
+        )
+        .returning(models.Order)
     )
-    
-    db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
+    db_order = (await db.execute(stmt)).scalar_one()
+    await db.commit()
     return db_order
 
 
-def update_order_status(
-    db: Session,
+async def update_order_status(
+    db: AsyncSession,
     order_id: int,
     status: str
 ) -> Optional[models.Order]:
     """Update order status."""
-    db_order = get_order(db, order_id)
+    db_order = await get_order(db, order_id)
     if not db_order:
         return None
-    
+
     db_order.status = status
-    db.commit()
-    db.refresh(db_order)
+    await db.commit()
+    await db.refresh(db_order)
     return db_order
 
 
-def delete_order(db: Session, order_id: int) -> bool:
+async def delete_order(db: AsyncSession, order_id: int) -> bool:
     """Delete an order (for testing/admin purposes)."""
-    db_order = get_order(db, order_id)
+    db_order = await get_order(db, order_id)
     if not db_order:
         return False
-    
-    db.delete(db_order)
-    db.commit()
+
+    await db.delete(db_order)
+    await db.commit()
     return True
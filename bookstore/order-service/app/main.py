@@ -1,21 +1,39 @@
 """Order Service - FastAPI Application."""
+import base64
+import binascii
+from contextlib import asynccontextmanager
+from datetime import datetime
 from fastapi import FastAPI, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from decimal import Decimal
 
 from . import crud, models, schemas
-from .database import engine, get_db
+from .database import engine, get_db, get_read_db
 from .catalog_client import catalog_client
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create tables and manage shared resources for the app's lifetime."""
+    # Create database tables
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+    # Warm up the pooled client so the first request skips creation
+    catalog_client.client
+    yield
+    await catalog_client.aclose()
+    await engine.dispose()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Bookstore Order Service",
     description="Microservice for managing customer orders",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
@@ -34,39 +52,39 @@ def health_check():
 @app.post("/orders", response_model=schemas.Order, status_code=201)
 async def create_order(
     order_data: schemas.OrderCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Place a new order.
     
     This endpoint:
-    1. Validates the book exists in the catalog
-    2. Checks if sufficient quantity is available
-    3. Creates the order with current pricing
-    
+    1. Atomically reserves the requested quantity in the catalog
+       (availability check + stock decrement in one round-trip)
+    2. Creates the order with current pricing
+
     - **book_id**: ID of the book to order (required)
     - **customer_name**: Name of the customer (required)
     - **customer_email**: Email of the customer (required)
     - **quantity**: Number of books to order (required, must be > 0)
     """
-    # Check book availability via Catalog Service
-    is_available, book_data, error_msg = await catalog_client.check_availability(
+    # Reserve stock via Catalog Service
+    reserved, book_data, error_msg = await catalog_client.reserve(
         order_data.book_id,
         order_data.quantity
     )
-    
-    if not is_available:
+
+    if not reserved:
         raise HTTPException(
             status_code=400,
             detail=error_msg or "Book is not available"
         )
-    
+
     # Extract book details
     book_title = book_data['title']
     unit_price = Decimal(str(book_data['price']))
-    
+
     # Create the order
-    db_order = crud.create_order(
+    db_order = await crud.create_order(
         db=db,
         book_id=order_data.book_id,
         book_title=book_title,
@@ -75,21 +93,18 @@ async def create_order(
         quantity=order_data.quantity,
         unit_price=unit_price
     )
-    
-    # Optional: Update inventory in catalog service (future enhancement)
-    # For now, we just verify availability but don't decrement stock
-    # This can be implemented later with proper transaction handling
-    
+
     return db_order
 
 
 @app.get("/orders", response_model=schemas.OrderList)
-def list_orders(
+async def list_orders(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     customer_email: Optional[str] = Query(None, description="Filter by customer email"),
     status: Optional[str] = Query(None, description="Filter by order status"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List all orders with optional filtering and pagination.
@@ -98,40 +113,54 @@ def list_orders(
     - **limit**: Maximum number of records to return
     - **customer_email**: Filter orders by customer email
     - **status**: Filter orders by status (pending, processing, confirmed, shipped, delivered, cancelled)
+    - **cursor**: Opaque keyset cursor from a previous page's next_cursor;
+      preferred over skip for deep pages as it stays fast at any depth
     """
-    orders = crud.get_orders(
+    cursor_val = None
+    if cursor:
+        try:
+            created_str, id_str = (
+                base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            )
+            cursor_val = (datetime.fromisoformat(created_str), int(id_str))
+        except (ValueError, binascii.Error):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    total, orders = await crud.get_orders(
         db,
         skip=skip,
         limit=limit,
         customer_email=customer_email,
-        status=status
-    )
-    total = crud.get_orders_count(
-        db,
-        customer_email=customer_email,
-        status=status
+        status=status,
+        cursor=cursor_val
     )
-    return {"total": total, "orders": orders}
+    next_cursor = None
+    if len(orders) == limit:
+        last = orders[-1]
+        next_cursor = base64.urlsafe_b64encode(
+            f"{last.created_at.isoformat()}|{last.id}".encode()
+        ).decode()
+    return {"total": total, "orders": orders, "next_cursor": next_cursor}
 
 
 @app.get("/orders/{order_id}", response_model=schemas.Order)
-def get_order(order_id: int, db: Session = Depends(get_db)):
+async def get_order(order_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Get order details and status.
     
     - **order_id**: The ID of the order to retrieve
     """
-    db_order = crud.get_order(db, order_id=order_id)
+    db_order = await crud.get_order(db, order_id=order_id)
     if db_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     return db_order
 
 
 @app.patch("/orders/{order_id}/status", response_model=schemas.Order)
-def update_order_status(
+async def update_order_status(
     order_id: int,
     status_update: schemas.OrderStatusUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update order status.
@@ -139,10 +168,10 @@ def update_order_status(
     - **order_id**: The ID of the order to update
     - **status**: New status (pending, processing, confirmed, shipped, delivered, cancelled)
     """
-    db_order = crud.update_order_status(
+    db_order = await crud.update_order_status(
         db,
         order_id=order_id,
-        status=status_update.status
+        status=status_update.status.value
     )
     
     if db_order is None:
@@ -152,7 +181,7 @@ def update_order_status(
 
 
 @app.get("/orders/{order_id}/book", response_model=schemas.BookAvailability)
-async def get_order_book_details(order_id: int, db: Session = Depends(get_db)):
+async def get_order_book_details(order_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Get current book details for an order (from Catalog Service).
     
@@ -160,7 +189,7 @@ async def get_order_book_details(order_id: int, db: Session = Depends(get_db)):
     
     - **order_id**: The ID of the order
     """
-    db_order = crud.get_order(db, order_id=order_id)
+    db_order = await crud.get_order(db, order_id=order_id)
     if db_order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     
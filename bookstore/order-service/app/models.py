@@ -1,6 +1,5 @@
 """SQLAlchemy models for the order service."""
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Computed, Index, func
 from .database import Base
 
 
@@ -16,10 +15,27 @@ class Order(Base):
     customer_email = Column(String(255), nullable=False, index=True)
     quantity = Column(Integer, nullable=False)
     unit_price = Column(Numeric(10, 2), nullable=False)
-    total_price = Column(Numeric(10, 2), nullable=False)
+    # Generated by the database so the multiplication happens once on
+    # INSERT instead of in Python Decimal arithmetic per order
+    total_price = Column(
+        Numeric(10, 2),
+        Computed('unit_price * quantity', persisted=True),
+        nullable=False
+    )
     status = Column(String(50), nullable=False, default='pending', index=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps are assigned by the database so they stay consistent
+    # across app workers with drifting clocks
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     def __repr__(self):
         return f"<Order(id={self.id}, book_id={self.book_id}, customer='{self.customer_name}', status='{self.status}')>"
+
+
+# Covering indexes matching the filter + ORDER BY created_at DESC shape of
+# crud.get_orders, so filtered listings are an index-range scan capped at
+# the page size instead of a filter-then-sort plan
+Index('orders_email_created', Order.customer_email, Order.created_at.desc(),
+      postgresql_include=['id', 'book_id', 'status', 'total_price'])
+Index('orders_status_created', Order.status, Order.created_at.desc(),
+      postgresql_include=['id', 'book_id', 'customer_email', 'total_price'])
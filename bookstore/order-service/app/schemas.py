@@ -1,10 +1,21 @@
 """Pydantic schemas for request/response validation."""
 from datetime import datetime
+from enum import Enum
 from typing import Optional
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 from decimal import Decimal
 
 
+class OrderStatus(str, Enum):
+    """Allowed order status values."""
+    pending = 'pending'
+    processing = 'processing'
+    confirmed = 'confirmed'
+    shipped = 'shipped'
+    delivered = 'delivered'
+    cancelled = 'cancelled'
+
+
 class OrderBase(BaseModel):
     """Base schema for order data."""
     book_id: int = Field(..., gt=0, description="ID of the book to order")
@@ -35,11 +46,12 @@ class OrderList(BaseModel):
     """Schema for list of orders response."""
     total: int
     orders: list[Order]
+    next_cursor: Optional[str] = None
 
 
 class OrderStatusUpdate(BaseModel):
     """Schema for updating order status."""
-    status: str = Field(..., pattern="^(pending|processing|confirmed|shipped|delivered|cancelled)$")
+    status: OrderStatus = Field(..., description="New order status")
 
 
 class Message(BaseModel):